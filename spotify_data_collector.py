@@ -3,19 +3,93 @@ Spotify Data Collector
 - Authenticates via SpotifyOAuth (env vars required)
 - Extracts: saved tracks, user playlists, first playlist's tracks,
   audio features (for saved tracks), and recently played tracks
-- Persists each dataset to timestamped JSON files in ./spotify_data
+- Persists each dataset to timestamped Parquet files in ./spotify_data
+  (JSON when pyarrow is missing, or additionally with --json)
 """
 
 import os
 import json
+import asyncio
 import logging
+import time
+import argparse
+import itertools
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import ExitStack, contextmanager
 from pathlib import Path
 from datetime import datetime
-from typing import Any, Dict, Iterable, List, Optional
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    TypeVar,
+)
+
+_T = TypeVar("_T")
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 import spotipy
 from spotipy.oauth2 import SpotifyOAuth
 
+# The module compiles with mypyc ("mypyc spotify_data_collector.py") for
+# faster per-row transform loops in repeated cron/ETL runs; deployments can
+# ship the resulting .so while dev keeps using the plain .py. The decorator
+# is a no-op when mypy_extensions (or compilation) is absent.
+try:
+    from mypy_extensions import mypyc_attr
+except ImportError:
+    def mypyc_attr(*attrs: str, **kwattrs: object) -> Callable[[_T], _T]:
+        def deco(cls: _T) -> _T:
+            return cls
+        return deco
+
+
+# orjson is a much faster drop-in serializer; fall back to stdlib if absent
+try:
+    import orjson
+except ImportError:
+    orjson = None  # type: ignore[assignment]
+
+# aiohttp enables the async fast path for high fan-out endpoints
+try:
+    import aiohttp
+except ImportError:
+    aiohttp = None  # type: ignore[assignment]
+
+# zstandard shrinks the highly redundant JSON dumps ~10x; outputs become
+# *.json.zst when available (see load_json for reading them back)
+try:
+    import zstandard as zstd
+except ImportError:
+    zstd = None  # type: ignore[assignment]
+
+# pyarrow enables columnar Parquet outputs: dictionary-encoded and ~10-20x
+# smaller than JSON for this repetitive tabular data
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = pq = None
+
+# ijson lets readers stream records without materializing the whole document;
+# prefer the yajl2 C backend when built (~5x faster than the pure-Python one)
+try:
+    import ijson.backends.yajl2_c as ijson
+except ImportError:
+    try:
+        import ijson
+    except ImportError:
+        ijson = None
+
 # Optional libs you might use later for transforms
 # import pandas as pd
 
@@ -29,7 +103,18 @@ SCOPES = (
 DATA_DIR = Path("spotify_data")
 DATA_DIR.mkdir(parents=True, exist_ok=True)
 
+# Local cache keyed by playlist snapshot_id; lets unchanged playlists skip
+# their paginated refetch entirely
+CACHE_DIR = DATA_DIR / ".cache"
+CACHE_DIR.mkdir(parents=True, exist_ok=True)
+
 AUDIO_FEATURES_BATCH = 100  # API max per call
+AUDIO_FEATURES_WORKERS = 8  # stays under Spotify's ~10 rps soft limit
+PARQUET_BATCH_ROWS = 1000   # rows buffered per Parquet row group
+
+# JSON dumps are the fallback when pyarrow is missing; --json re-enables
+# them alongside Parquet
+JSON_ENABLED = False
 PLAYLIST_ITEMS_BATCH = 100  # API max per call
 SAVED_TRACKS_BATCH = 50     # API default max per call
 PLAYLISTS_BATCH = 50        # API default max per call
@@ -47,80 +132,320 @@ log = logging.getLogger("spotify-etl")
 # --------------------------
 # Utility helpers
 # --------------------------
-def timestamp() -> str:
-    return datetime.now().strftime("%Y%m%d_%H%M%S")
+# One timestamp per run plus a monotonic per-dump counter: keeps strftime
+# out of the dump path and guarantees unique filenames even when the
+# parallel collectors dump within the same second (count.__next__ is atomic
+# under the GIL).
+RUN_TS = datetime.now().strftime("%Y%m%d_%H%M%S")
+_dump_counter = itertools.count()
+
+
+def _output_stem(prefix: str) -> str:
+    return f"{prefix}_{RUN_TS}_{next(_dump_counter):02d}"
+
+
+def _output_path(prefix: str) -> Path:
+    """Timestamped output path; *.json.zst when zstandard is available."""
+    suffix = ".json.zst" if zstd is not None else ".json"
+    return DATA_DIR / f"{_output_stem(prefix)}{suffix}"
+
+
+@contextmanager
+def _open_sink(fp: Path, compress: Optional[bool] = None):
+    """Open fp for binary writing, wrapping in a zstd stream_writer when
+    compressing. By default compression follows the *.zst suffix."""
+    if compress is None:
+        compress = fp.name.endswith(".zst")
+    with fp.open("wb") as raw:
+        if compress:
+            cctx = zstd.ZstdCompressor(level=3, threads=-1)
+            with cctx.stream_writer(raw) as out:
+                yield out
+        else:
+            yield raw
 
 
 def dump_json(payload: Any, prefix: str) -> Path:
-    """Write JSON to ./spotify_data/<prefix>_<ts>.json and return the path."""
-    fp = DATA_DIR / f"{prefix}_{timestamp()}.json"
-    with fp.open("w", encoding="utf-8") as f:
-        json.dump(payload, f, ensure_ascii=False, indent=4)
+    """Write JSON to ./spotify_data/<prefix>_<ts>.json[.zst]; return the path."""
+    fp = _output_path(prefix)
+    with _open_sink(fp) as f:
+        if orjson is not None:
+            f.write(orjson.dumps(payload, option=orjson.OPT_INDENT_2))
+        else:
+            f.write(json.dumps(payload, ensure_ascii=False, indent=4).encode("utf-8"))
     log.info("Saved -> %s", fp)
     return fp
 
 
-def chunk(seq: List[str], size: int) -> Iterable[List[str]]:
-    """Yield successive chunks of length <= size."""
-    for i in range(0, len(seq), size):
-        yield seq[i : i + size]
+def load_json(path: Any) -> Any:
+    """Load a collector dump, transparently decompressing *.json.zst.
+
+    Intended for downstream notebooks reading these files back.
+    """
+    path = Path(path)
+    if path.name.endswith(".zst"):
+        if zstd is None:
+            raise RuntimeError(f"zstandard is required to read {path}")
+        with path.open("rb") as raw:
+            data = zstd.ZstdDecompressor().stream_reader(raw).read()
+    else:
+        data = path.read_bytes()
+    return orjson.loads(data) if orjson is not None else json.loads(data)
+
+
+def iter_records(path: Any, prefix: str = "item") -> Iterator[Any]:
+    """Yield records from a collector dump one at a time.
+
+    This is the recommended way to read collector output downstream: the
+    dumps are top-level arrays, so ``prefix="item"`` streams each row in
+    constant memory instead of materializing the whole file the way
+    load_json does. Falls back to a full load when ijson is unavailable.
+    """
+    path = Path(path)
+    if ijson is None:
+        yield from load_json(path)
+        return
+    with path.open("rb") as raw:
+        if path.name.endswith(".zst"):
+            if zstd is None:
+                raise RuntimeError(f"zstandard is required to read {path}")
+            f = zstd.ZstdDecompressor().stream_reader(raw)
+        else:
+            f = raw
+        yield from ijson.items(f, prefix)
+
+
+def _write_json_stream(
+    fp: Path, rows: Iterable[Any], compress: Optional[bool] = None
+) -> None:
+    with _open_sink(fp, compress=compress) as f:
+        f.write(b"[")
+        first = True
+        for row in rows:
+            if not first:
+                f.write(b",\n")
+            first = False
+            if orjson is not None:
+                f.write(orjson.dumps(row))
+            else:
+                f.write(json.dumps(row, ensure_ascii=False).encode("utf-8"))
+        f.write(b"]")
+
+
+def _null_safe_schema(schema: Any) -> Any:
+    """Promote null-inferred fields to string so the Parquet writer schema
+    can absorb later batches. A column like preview_url or added_by_id can
+    be all-null for an entire first batch while populated further in; every
+    nullable scalar field in the collector rows is a string, as are the
+    elements of the artist id/name list columns."""
+    fields = []
+    for field in schema:
+        if pa.types.is_null(field.type):
+            field = field.with_type(pa.string())
+        elif pa.types.is_list(field.type) and pa.types.is_null(field.type.value_type):
+            field = field.with_type(pa.list_(pa.string()))
+        fields.append(field)
+    return pa.schema(fields)
+
+
+def write_rows(rows: Iterable[Dict[str, Any]], prefix: str) -> List[Path]:
+    """Single-pass sink for tabular rows.
+
+    Writes zstd-compressed Parquet when pyarrow is installed (batched into
+    row groups, so generators never materialize fully) and streams JSON
+    when pyarrow is missing or --json was given. Returns the output paths.
+    """
+    write_json = pq is None or JSON_ENABLED
+    stem = _output_stem(prefix)  # shared so paired JSON/Parquet files match
+    paths: List[Path] = []
+    with ExitStack() as stack:
+        jf = None
+        if write_json:
+            json_suffix = ".json.zst" if zstd is not None else ".json"
+            json_fp = DATA_DIR / f"{stem}{json_suffix}"
+            jf = stack.enter_context(_open_sink(json_fp))
+            jf.write(b"[")
+            paths.append(json_fp)
+
+        writer: Optional[Any] = None
+        batch: List[Dict[str, Any]] = []
+        if pq is not None:
+            pq_fp = DATA_DIR / f"{stem}.parquet"
+            paths.append(pq_fp)
+
+        def flush() -> None:
+            nonlocal writer
+            if not batch:
+                return
+            if writer is None:
+                # Infer from the first batch, promoting null-typed fields to
+                # string first: an all-null column here would otherwise lock
+                # the file to pa.null() and reject populated later batches.
+                inferred = pa.Table.from_pylist(batch).schema
+                writer = stack.enter_context(
+                    pq.ParquetWriter(
+                        pq_fp, _null_safe_schema(inferred), compression="zstd"
+                    )
+                )
+            # Pin every batch to the writer's schema: a column that is
+            # all-null in one batch but populated in another (preview_url,
+            # local tracks' ids) would otherwise re-infer a different type
+            # and fail ParquetWriter's schema check mid-file.
+            table = pa.Table.from_pylist(batch, schema=writer.schema)
+            writer.write_table(table)
+            batch.clear()
+
+        first = True
+        for row in rows:
+            if jf is not None:
+                if not first:
+                    jf.write(b",\n")
+                first = False
+                if orjson is not None:
+                    jf.write(orjson.dumps(row))
+                else:
+                    jf.write(json.dumps(row, ensure_ascii=False).encode("utf-8"))
+            if pq is not None:
+                batch.append(row)
+                if len(batch) >= PARQUET_BATCH_ROWS:
+                    flush()
+
+        if jf is not None:
+            jf.write(b"]")
+        if pq is not None:
+            flush()
+            if writer is None:  # no rows at all: still emit an empty file
+                pq.write_table(pa.Table.from_pylist([]), pq_fp, compression="zstd")
+
+    for p in paths:
+        log.info("Saved -> %s", p)
+    return paths
+
+
+try:
+    # C-implemented on Python 3.12+ and accepts any iterable (yields tuples)
+    from itertools import batched as chunk  # type: ignore[attr-defined]
+except ImportError:
+    def chunk(seq: List[str], size: int) -> Iterable[List[str]]:  # type: ignore[misc]
+        """Yield successive chunks of length <= size."""
+        for i in range(0, len(seq), size):
+            yield seq[i : i + size]
+
+
+# Album/artist strings repeat heavily across a library (every track of an
+# album carries the same names), so rows share one canonical copy instead of
+# each holding its own. setdefault is atomic under the GIL; collectors clear
+# the cache once their rows are flushed.
+_intern: Dict[str, str] = {}
+
+
+def _interned(value: Optional[str]) -> Optional[str]:
+    if value is None:
+        return None
+    return _intern.setdefault(value, value)
+
+
+def _flatten_track(track: Dict[str, Any]) -> Dict[str, Any]:
+    """Flatten the track-core fields shared by the saved-tracks and
+    playlist-tracks rows (single pass over the artists)."""
+    artist_ids: List[Optional[str]] = []
+    artist_names: List[Optional[str]] = []
+    for a in track.get("artists") or ():
+        artist_ids.append(_interned(a.get("id")))
+        artist_names.append(_interned(a.get("name")))
+    album = track.get("album") or {}
+    external_urls = track.get("external_urls") or {}
+    return {
+        "track_id": track.get("id"),
+        "track_name": track.get("name"),
+        "artist_ids": artist_ids,
+        "artist_names": artist_names,
+        "album_id": _interned(album.get("id")),
+        "album_name": _interned(album.get("name")),
+        "duration_ms": track.get("duration_ms"),
+        "popularity": track.get("popularity"),
+        "external_url": external_urls.get("spotify"),
+        "preview_url": track.get("preview_url"),
+        "is_local": track.get("is_local", False),
+    }
 
 
 # --------------------------
 # Core Client
 # --------------------------
+@mypyc_attr(allow_interpreted_subclasses=False)
 class SpotifyCollector:
     def __init__(self, scopes: str = SCOPES) -> None:
-        self.sp = spotipy.Spotify(auth_manager=SpotifyOAuth(scope=scopes))
+        # One pooled session per client amortizes TCP/TLS handshakes over
+        # the many paginated requests and bakes in retry/backoff for
+        # transient server errors.
+        sess = requests.Session()
+        sess.mount(
+            "https://",
+            HTTPAdapter(
+                pool_connections=16,
+                pool_maxsize=16,
+                max_retries=Retry(
+                    total=5,
+                    backoff_factor=0.3,
+                    status_forcelist=[429, 500, 502, 503, 504],
+                ),
+            ),
+        )
+        self.sp = spotipy.Spotify(
+            auth_manager=SpotifyOAuth(scope=scopes), requests_session=sess
+        )
         me = self.sp.current_user()
         log.info("Authenticated as %s (%s)", me.get("display_name"), me.get("id"))
 
-    # Generic paginator for endpoints that return {'items': [...], 'next': url}
-    def _gather_items(self, fn, **kwargs) -> List[Dict[str, Any]]:
+    # Generic paginator for endpoints that return {'items': [...], 'next': url}.
+    # Generator, so memory stays at one page and it fuses with write_rows.
+    def _iter_items(self, fn, **kwargs) -> Iterator[Dict[str, Any]]:
+        pages = 1
         page = fn(**kwargs)
-        items = list(page.get("items", []))
+        yield from page.get("items", [])
         while page.get("next"):
             page = self.sp.next(page)
-            items.extend(page.get("items", []))
-        return items
+            pages += 1
+            yield from page.get("items", [])
+        if log.isEnabledFor(logging.DEBUG):
+            log.debug("paginator=%s pages=%d", getattr(fn, "__name__", fn), pages)
 
     # 1) Saved tracks (library)
-    def collect_saved_tracks(self) -> List[Dict[str, Any]]:
-        log.info("Fetching saved tracks ...")
-        raw = self._gather_items(
-            self.sp.current_user_saved_tracks, limit=SAVED_TRACKS_BATCH
+    def collect_saved_tracks(self) -> List[str]:
+        """Stream saved-track rows to disk; return the non-local track IDs
+        (kept separately so audio-features collection stays decoupled)."""
+        t0 = time.perf_counter()
+        track_ids: List[str] = []
+        count = 0
+
+        def rows() -> Iterator[Dict[str, Any]]:
+            nonlocal count
+            for row in self._iter_items(
+                self.sp.current_user_saved_tracks, limit=SAVED_TRACKS_BATCH
+            ):
+                track = row.get("track") or {}
+                if not track:
+                    continue
+                if track.get("id") and not track.get("is_local", False):
+                    track_ids.append(track["id"])
+                count += 1
+                yield {"added_at": row.get("added_at"), **_flatten_track(track)}
+
+        write_rows(rows(), "saved_tracks")
+        _intern.clear()
+        log.info(
+            "collector=saved_tracks items=%d elapsed=%.2fs",
+            count,
+            time.perf_counter() - t0,
         )
-        processed: List[Dict[str, Any]] = []
-        for row in raw:
-            track = row.get("track") or {}
-            if not track:
-                continue
-            processed.append(
-                {
-                    "added_at": row.get("added_at"),
-                    "track_id": track.get("id"),
-                    "track_name": track.get("name"),
-                    "artist_ids": [a.get("id") for a in track.get("artists", [])],
-                    "artist_names": [a.get("name") for a in track.get("artists", [])],
-                    "album_id": (track.get("album") or {}).get("id"),
-                    "album_name": (track.get("album") or {}).get("name"),
-                    "duration_ms": track.get("duration_ms"),
-                    "popularity": track.get("popularity"),
-                    "external_url": (track.get("external_urls") or {}).get("spotify"),
-                    "preview_url": track.get("preview_url"),
-                    "is_local": track.get("is_local", False),
-                }
-            )
-        dump_json(processed, "saved_tracks")
-        log.info("Saved tracks count: %d", len(processed))
-        return processed
+        return track_ids
 
     # 2) User playlists (metadata only)
     def collect_playlists(self) -> List[Dict[str, Any]]:
-        log.info("Fetching user playlists ...")
-        raw = self._gather_items(self.sp.current_user_playlists, limit=PLAYLISTS_BATCH)
+        t0 = time.perf_counter()
         processed: List[Dict[str, Any]] = []
-        for pl in raw:
+        for pl in self._iter_items(self.sp.current_user_playlists, limit=PLAYLISTS_BATCH):
             processed.append(
                 {
                     "playlist_id": pl.get("id"),
@@ -135,14 +460,18 @@ class SpotifyCollector:
                     "external_url": (pl.get("external_urls") or {}).get("spotify"),
                 }
             )
-        dump_json(processed, "user_playlists")
-        log.info("Playlists count: %d", len(processed))
+        write_rows(processed, "user_playlists")
+        log.info(
+            "collector=user_playlists items=%d elapsed=%.2fs",
+            len(processed),
+            time.perf_counter() - t0,
+        )
         return processed
 
     # 3) Tracks from a specific playlist (here: first playlist)
     def collect_first_playlist_tracks(
         self, playlists: List[Dict[str, Any]]
-    ) -> Optional[List[Dict[str, Any]]]:
+    ) -> Optional[Path]:
         if not playlists:
             log.warning("No playlists found; skipping playlist item extraction.")
             return None
@@ -150,42 +479,129 @@ class SpotifyCollector:
         first = playlists[0]
         pl_id = first["playlist_id"]
         pl_name = first["playlist_name"]
-        log.info("Fetching tracks for playlist: '%s' (%s)", pl_name, pl_id)
-
-        # Paginate playlist items (max 100 per page)
-        page = self.sp.playlist_items(pl_id, limit=PLAYLIST_ITEMS_BATCH)
-        items = list(page.get("items", []))
-        while page.get("next"):
-            page = self.sp.next(page)
-            items.extend(page.get("items", []))
-
-        processed: List[Dict[str, Any]] = []
-        for it in items:
-            track = (it or {}).get("track") or {}
-            if not track:
-                continue
-            processed.append(
-                {
+        snapshot = first.get("snapshot_id")
+
+        prefix = f"playlist_{pl_id}_tracks"
+        cache_suffix = ".json.zst" if zstd is not None else ".json"
+        cache_fp = (
+            CACHE_DIR / f"playlist_{pl_id}_{snapshot}{cache_suffix}"
+            if snapshot
+            else None
+        )
+        if cache_fp is not None and cache_fp.exists():
+            # Snapshot unchanged since last run: reuse the cached rows and
+            # skip the whole paginated refetch.
+            log.info(
+                "Playlist '%s' unchanged (snapshot %s); using cached tracks",
+                pl_name,
+                snapshot,
+            )
+            return write_rows(iter_records(cache_fp), prefix)[0]
+
+        if log.isEnabledFor(logging.DEBUG):
+            log.debug("Fetching tracks for playlist: '%s' (%s)", pl_name, pl_id)
+
+        t0 = time.perf_counter()
+        count = 0
+
+        def rows() -> Iterator[Dict[str, Any]]:
+            nonlocal count
+            for it in self._iter_items(
+                self.sp.playlist_items, playlist_id=pl_id, limit=PLAYLIST_ITEMS_BATCH
+            ):
+                track = (it or {}).get("track") or {}
+                if not track:
+                    continue
+                count += 1
+                yield {
                     "playlist_id": pl_id,
                     "added_at": it.get("added_at"),
                     "added_by_id": (it.get("added_by") or {}).get("id"),
-                    "track_id": track.get("id"),
-                    "track_name": track.get("name"),
-                    "artist_ids": [a.get("id") for a in track.get("artists", [])],
-                    "artist_names": [a.get("name") for a in track.get("artists", [])],
-                    "album_id": (track.get("album") or {}).get("id"),
-                    "album_name": (track.get("album") or {}).get("name"),
-                    "duration_ms": track.get("duration_ms"),
-                    "popularity": track.get("popularity"),
-                    "external_url": (track.get("external_urls") or {}).get("spotify"),
-                    "preview_url": track.get("preview_url"),
-                    "is_local": track.get("is_local", False),
+                    **_flatten_track(track),
                 }
-            )
 
-        dump_json(processed, f"playlist_{pl_id}_tracks")
-        log.info("Tracks in first playlist: %d", len(processed))
-        return processed
+        if cache_fp is not None:
+            # Stream into the cache first, publish it atomically, then emit
+            # the timestamped outputs from the cached rows.
+            tmp_fp = cache_fp.with_name(cache_fp.name + ".tmp")
+            _write_json_stream(tmp_fp, rows(), compress=zstd is not None)
+            # Evict the snapshots this one supersedes so the cache holds at
+            # most one entry per playlist.
+            for stale in CACHE_DIR.glob(f"playlist_{pl_id}_*"):
+                if stale != tmp_fp:
+                    stale.unlink(missing_ok=True)
+            os.replace(tmp_fp, cache_fp)
+            paths = write_rows(iter_records(cache_fp), prefix)
+        else:
+            paths = write_rows(rows(), prefix)
+        _intern.clear()
+        log.info(
+            "collector=playlist_tracks playlist=%s items=%d elapsed=%.2fs",
+            pl_id,
+            count,
+            time.perf_counter() - t0,
+        )
+        return paths[0]
+
+    def _audio_features_batch(self, group: Sequence[str]) -> List[Dict[str, Any]]:
+        """Fetch one batch of audio features, sleeping out 429 rate limits."""
+        while True:
+            try:
+                return self.sp.audio_features(group) or []
+            except spotipy.SpotifyException as exc:
+                if exc.http_status != 429:
+                    raise
+                wait = int((exc.headers or {}).get("Retry-After", 1))
+                log.warning("Rate limited; retrying in %ds", wait)
+                time.sleep(wait)
+
+    async def _audio_features_async(
+        self, groups: List[Sequence[str]]
+    ) -> List[List[Dict[str, Any]]]:
+        """Fetch all audio-feature batches on one aiohttp session.
+
+        A single event loop multiplexes the in-flight requests over one TCP
+        pool, which is cheaper than a thread per request; the semaphore keeps
+        concurrency at the same ceiling as the threaded path. Reuses the
+        bearer token already held by spotipy's auth manager.
+        """
+        token = self.sp.auth_manager.get_access_token(as_dict=False)
+        sem = asyncio.Semaphore(AUDIO_FEATURES_WORKERS)
+
+        async def fetch(session: Any, group: Sequence[str]) -> List[Dict[str, Any]]:
+            params = {"ids": ",".join(group)}
+            async with sem:
+                # Mirror the session-level Retry policy of the threaded path:
+                # unbounded waits on 429, bounded backoff on transient 5xx.
+                # The sleep happens after leaving the response context (mypyc
+                # cannot compile continue inside the async with).
+                attempts = 0
+                while True:
+                    async with session.get(
+                        "https://api.spotify.com/v1/audio-features", params=params
+                    ) as resp:
+                        if resp.status == 429:
+                            wait = float(resp.headers.get("Retry-After", 1))
+                            log.warning("Rate limited; retrying in %ds", int(wait))
+                        elif resp.status in (500, 502, 503, 504) and attempts < 5:
+                            attempts += 1
+                            wait = 0.3 * (2 ** attempts)
+                            log.warning(
+                                "HTTP %d from audio-features; retry %d/5 in %.1fs",
+                                resp.status,
+                                attempts,
+                                wait,
+                            )
+                        else:
+                            resp.raise_for_status()
+                            payload = await resp.json()
+                            return payload.get("audio_features") or []
+                    await asyncio.sleep(wait)
+
+        async with aiohttp.ClientSession(
+            headers={"Authorization": f"Bearer {token}"}
+        ) as session:
+            return await asyncio.gather(*(fetch(session, g) for g in groups))
 
     # 4) Audio features for a set of track IDs (e.g., saved tracks)
     def collect_audio_features_for_tracks(
@@ -196,47 +612,79 @@ class SpotifyCollector:
             log.warning("No valid track IDs for audio features.")
             return []
 
-        log.info("Fetching audio features for %d tracks ...", len(valid_ids))
-        all_feats: List[Dict[str, Any]] = []
-        for group in chunk(valid_ids, AUDIO_FEATURES_BATCH):
-            feats = self.sp.audio_features(group) or []
-            # Filter out None entries
-            all_feats.extend([f for f in feats if f])
-
-        dump_json(all_feats, prefix)
-        log.info("Audio features rows: %d", len(all_feats))
+        t0 = time.perf_counter()
+        groups = list(chunk(valid_ids, AUDIO_FEATURES_BATCH))
+        if aiohttp is not None:
+            results = asyncio.run(self._audio_features_async(groups))
+        else:
+            with ThreadPoolExecutor(max_workers=AUDIO_FEATURES_WORKERS) as ex:
+                results = list(ex.map(self._audio_features_batch, groups))
+        # Flatten and filter out None entries
+        all_feats: List[Dict[str, Any]] = [f for feats in results for f in feats if f]
+
+        write_rows(all_feats, prefix)
+        log.info(
+            "collector=audio_features batches=%d items=%d elapsed=%.2fs",
+            len(groups),
+            len(all_feats),
+            time.perf_counter() - t0,
+        )
         return all_feats
 
     # 5) Recently played (last 50)
     def collect_recently_played(self) -> List[Dict[str, Any]]:
-        log.info("Fetching recently played tracks (last 50) ...")
+        t0 = time.perf_counter()
         payload = self.sp.current_user_recently_played(limit=50) or {}
         items = payload.get("items", [])
         processed: List[Dict[str, Any]] = []
         for row in items:
             track = (row or {}).get("track") or {}
+            artist_ids: List[Optional[str]] = []
+            artist_names: List[Optional[str]] = []
+            for a in track.get("artists") or ():
+                artist_ids.append(a.get("id"))
+                artist_names.append(a.get("name"))
+            album = track.get("album") or {}
+            context = row.get("context") or {}
             processed.append(
                 {
                     "played_at": row.get("played_at"),
                     "track_id": track.get("id"),
                     "track_name": track.get("name"),
-                    "artist_ids": [a.get("id") for a in track.get("artists", [])],
-                    "artist_names": [a.get("name") for a in track.get("artists", [])],
-                    "album_id": (track.get("album") or {}).get("id"),
-                    "album_name": (track.get("album") or {}).get("name"),
-                    "context_type": (row.get("context") or {}).get("type"),
-                    "context_uri": (row.get("context") or {}).get("uri"),
+                    "artist_ids": artist_ids,
+                    "artist_names": artist_names,
+                    "album_id": album.get("id"),
+                    "album_name": album.get("name"),
+                    "context_type": context.get("type"),
+                    "context_uri": context.get("uri"),
                 }
             )
-        dump_json(processed, "recently_played")
-        log.info("Recently played count: %d", len(processed))
+        write_rows(processed, "recently_played")
+        log.info(
+            "collector=recently_played items=%d elapsed=%.2fs",
+            len(processed),
+            time.perf_counter() - t0,
+        )
         return processed
 
 
 # --------------------------
 # Entry point
 # --------------------------
-def main() -> None:
+def main(argv: Optional[List[str]] = None) -> None:
+    global JSON_ENABLED
+
+    parser = argparse.ArgumentParser(description="Collect Spotify listening data.")
+    parser.add_argument(
+        "--json",
+        action="store_true",
+        help="also write JSON dumps alongside Parquet (JSON is the default "
+        "only when pyarrow is not installed)",
+    )
+    args = parser.parse_args(argv)
+    if args.json:
+        JSON_ENABLED = True
+
     # Ensure environment variables exist before attempting auth
     for var in ("SPOTIPY_CLIENT_ID", "SPOTIPY_CLIENT_SECRET", "SPOTIPY_REDIRECT_URI"):
         if not os.getenv(var):
@@ -245,29 +693,40 @@ def main() -> None:
                 "Set it before running this script."
             )
 
+    # Authenticate once up front so the OAuth prompt (if any) happens on the
+    # main thread and the token lands in spotipy's on-disk cache.
     try:
-        client = SpotifyCollector(scopes=SCOPES)
+        SpotifyCollector(scopes=SCOPES)
     except Exception as exc:
         log.error("Authentication failed: %s", exc)
         return
 
-    # 1) Library (saved tracks)
-    saved_tracks = client.collect_saved_tracks()
-
-    # 2) Playlists
-    playlists = client.collect_playlists()
-
-    # 3) First playlist tracks (if any)
-    client.collect_first_playlist_tracks(playlists)
-
-    # 4) Audio features for saved tracks (only non-local with valid IDs)
-    saved_track_ids = [
-        t["track_id"] for t in saved_tracks if t.get("track_id") and not t.get("is_local")
-    ]
-    client.collect_audio_features_for_tracks(saved_track_ids)
-
-    # 5) Recently played
-    client.collect_recently_played()
+    # spotipy's client is not thread-safe across calls (shared auth refresh),
+    # so each worker thread gets its own SpotifyCollector; the cached token
+    # means no extra auth prompts.
+    tls = threading.local()
+
+    def client() -> SpotifyCollector:
+        if getattr(tls, "collector", None) is None:
+            tls.collector = SpotifyCollector(scopes=SCOPES)
+        return tls.collector
+
+    # The five collectors are independent network-bound calls except for two
+    # edges: audio features needs the saved-track IDs, and the first-playlist
+    # extraction needs the playlist metadata. Run everything else in parallel
+    # and chain the second wave on the first.
+    with ThreadPoolExecutor(max_workers=3) as ex:
+        f_saved = ex.submit(lambda: client().collect_saved_tracks())
+        f_playlists = ex.submit(lambda: client().collect_playlists())
+        f_recent = ex.submit(lambda: client().collect_recently_played())
+        f_first = ex.submit(
+            lambda: client().collect_first_playlist_tracks(f_playlists.result())
+        )
+        f_feats = ex.submit(
+            lambda: client().collect_audio_features_for_tracks(f_saved.result())
+        )
+        for fut in (f_recent, f_first, f_feats):
+            fut.result()
 
     log.info("--- Extraction complete ---")
     log.info("All datasets saved in: %s", DATA_DIR.resolve())